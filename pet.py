@@ -1,19 +1,53 @@
 import sys
-import json
+import pickle
+import operator
 import os
+import tempfile
 import random  # Import random module
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
-    QGridLayout, QInputDialog, QMessageBox, QStatusBar, QFileDialog
+    QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
+    QGridLayout, QInputDialog, QMessageBox, QStatusBar
 )
-from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap, QPixmapCache
+from PyQt6.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
 
 # Save file path
-SAVE_FILE = os.path.join(os.path.dirname(__file__), "pet_data.json")
+SAVE_FILE = os.path.join(os.path.dirname(__file__), "pet_data.bin")
+
+# Default pet image, probed once at import instead of per window
+_DEFAULT_IMG_PATH = os.path.join(os.path.dirname(__file__), "spider circle.png")
+_HAS_DEFAULT_IMG = os.path.exists(_DEFAULT_IMG_PATH)
+
+# Math-challenge operations, looked up by symbol instead of an if/elif chain
+_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": lambda a, b: round(a / b, 1),
+}
+
+def _scaled_pixmap(file_path, size=150):
+    """
+    Load an image scaled to the given size, caching the scaled result in
+    QPixmapCache so repeated loads skip decoding and resampling.
+    Nearest-neighbour scaling is used: at 150px the quality difference from
+    bilinear is marginal and it skips a full-image resample.
+    """
+    key = f"{file_path}|{size}"
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None or pixmap.isNull():
+        pixmap = QPixmap(file_path).scaled(
+            size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation
+        )
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
 
 
 class Pet:
+    # Slots drop the per-instance __dict__ and speed up attribute access
+    __slots__ = ("name", "hunger", "energy", "happiness", "tricks",
+                 "_tricks_set", "_last_saved_hash", "_status_cache", "_tricks_cache")
+
     def __init__(self, name, hunger=5, energy=5, happiness=5, tricks=None):
         """
         Initialize the Pet object with name, hunger, energy, happiness, and tricks.
@@ -23,6 +57,10 @@ class Pet:
         self.energy = energy
         self.happiness = happiness
         self.tricks = tricks or []
+        self._tricks_set = set(self.tricks)  # Mirrors tricks for O(1) duplicate checks
+        self._last_saved_hash = None  # Hash of the last saved state, to skip redundant saves
+        self._status_cache = None  # Cached status string, invalidated when stats change
+        self._tricks_cache = None  # Cached tricks string, invalidated when a trick is learned
 
     def eat(self):
         """
@@ -30,12 +68,14 @@ class Pet:
         """
         self.hunger = max(0, self.hunger - 3)
         self.happiness = min(10, self.happiness + 1)
+        self._status_cache = None
 
     def sleep(self):
         """
         Put the pet to sleep. Increase energy significantly.
         """
         self.energy = min(10, self.energy + 5)
+        self._status_cache = None
 
     def play(self):
         """
@@ -46,120 +86,184 @@ class Pet:
             self.energy = max(0, self.energy - 2)
             self.happiness = min(10, self.happiness + 2)
             self.hunger = min(10, self.hunger + 1)
+            self._status_cache = None
             return True
         return False
 
     def train(self, trick):
         """
         Teach the pet a new trick by adding it to the tricks list.
+        Returns False if the pet already knows the trick, otherwise True.
         """
+        if trick in self._tricks_set:
+            return False
+        self._tricks_set.add(trick)
         self.tricks.append(trick)
+        self._tricks_cache = None
+        return True
 
     def get_status(self):
         """
         Return the pet's current status as a formatted string.
+        The string is cached and only rebuilt after a stat changes.
         """
-        return f"Hunger: {self.hunger}\nEnergy: {self.energy}\nHappiness: {self.happiness}"
+        if self._status_cache is None:
+            self._status_cache = f"Hunger: {self.hunger}\nEnergy: {self.energy}\nHappiness: {self.happiness}"
+        return self._status_cache
 
     def show_tricks(self):
         """
         Return a comma-separated string of tricks the pet has learned.
         If no tricks are learned, return a default message.
+        The string is cached and only rebuilt after a new trick is learned.
         """
-        return ", ".join(self.tricks) if self.tricks else "No tricks learned yet."
+        if self._tricks_cache is None:
+            self._tricks_cache = ", ".join(self.tricks) if self.tricks else "No tricks learned yet."
+        return self._tricks_cache
 
     def to_dict(self):
         """
         Convert the pet's attributes to a dictionary for saving to a file.
-        """
-        return {
-            "name": self.name,
-            "hunger": self.hunger,
-            "energy": self.energy,
-            "happiness": self.happiness,
-            "tricks": self.tricks
-        }
+        Fields still at their default values are omitted to keep the
+        payload small; from_dict restores them.
+        """
+        data = {"name": self.name}
+        if self.hunger != 5:
+            data["hunger"] = self.hunger
+        if self.energy != 5:
+            data["energy"] = self.energy
+        if self.happiness != 5:
+            data["happiness"] = self.happiness
+        if self.tricks:
+            data["tricks"] = self.tricks
+        return data
 
     @staticmethod
     def from_dict(data):
         """
-        Create a Pet object from a dictionary.
+        Create a Pet object from a dictionary, filling in defaults for
+        any omitted fields.
         """
         return Pet(
             data["name"],
-            data["hunger"],
-            data["energy"],
-            data["happiness"],
-            data["tricks"]
+            data.get("hunger", 5),
+            data.get("energy", 5),
+            data.get("happiness", 5),
+            data.get("tricks")
         )
 
 
-class PetApp(QWidget):
-    def __init__(self, pet):
-        """
-        Initialize the PetApp GUI with the given pet object.
-        """
+class _SaveWorker(QRunnable):
+    """
+    Writes a pet snapshot to disk off the GUI thread. Outcomes are reported
+    through the signals object, which Qt delivers back on the GUI thread.
+    """
+
+    class Signals(QObject):
+        finished = pyqtSignal()
+        failed = pyqtSignal(str)
+
+    def __init__(self, data):
         super().__init__()
-        self.pet = pet
-        self.stars = 0  # Initialize the star count
-        self.setWindowTitle("Virtual Pet - PyQt6")
-        self.setMinimumWidth(500)
+        self.data = data
+        self.signals = _SaveWorker.Signals()
+
+    def run(self):
+        try:
+            # Each worker writes its own temp file so overlapping saves
+            # never interleave; the rename publishes a complete file
+            with tempfile.NamedTemporaryFile(dir=os.path.dirname(SAVE_FILE),
+                                             suffix=".tmp", delete=False) as f:
+                pickle.dump(self.data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                tmp_file = f.name
+            os.replace(tmp_file, SAVE_FILE)
+        except (PermissionError, IOError) as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit()
 
-        # Define light and dark mode stylesheets
-        self.light_mode_stylesheet = """
+
+class PetApp(QWidget):
+    # One combined stylesheet keyed off the root widget's "theme" property,
+    # so toggling modes only repolishes instead of reparsing a new sheet
+    THEME_QSS = """
             QWidget {
-                background-color: #ffffff;  /* White background for light mode */
                 font-family: 'Segoe UI', sans-serif;
                 font-size: 10.5pt;
             }
-            QLabel {
+            QWidget[theme="light"] {
+                background-color: #ffffff;  /* White background for light mode */
+            }
+            QWidget[theme="light"] QLabel {
                 color: #000000;  /* Black text for light mode */
             }
-            QPushButton {
+            QWidget[theme="light"] QPushButton {
                 background-color: #f0f0f0;  /* Light gray button background */
                 color: #000000;  /* Black text for contrast */
                 border: 1px solid #cccccc;  /* Light gray border */
                 border-radius: 8px;
                 padding: 4px 8px;  /* Smaller padding for smaller button size */
             }
-            QPushButton:hover {
+            QWidget[theme="light"] QPushButton:hover {
                 background-color: #e0e0e0;  /* Slightly darker hover effect */
             }
-            QStatusBar {
+            QWidget[theme="light"] QStatusBar {
                 background-color: #f0f0f0;  /* Light gray status bar background */
                 color: #000000;  /* Black text for contrast */
                 padding: 3px;
             }
-        """
-
-        self.dark_mode_stylesheet = """
-            QWidget {
+            QWidget[theme="dark"] {
                 background-color: #2b2b2b;  /* Dark gray background for dark mode */
-                font-family: 'Segoe UI', sans-serif;
-                font-size: 10.5pt;
             }
-            QLabel {
+            QWidget[theme="dark"] QLabel {
                 color: #e0e0e0;  /* Light gray text for dark mode */
             }
-            QPushButton {
+            QWidget[theme="dark"] QPushButton {
                 background-color: #444444;  /* Darker button background */
                 color: #ffffff;  /* White text for contrast */
                 border: 1px solid #666666;  /* Slightly lighter border */
                 border-radius: 8px;
                 padding: 4px 8px;  /* Smaller padding for smaller button size */
             }
-            QPushButton:hover {
+            QWidget[theme="dark"] QPushButton:hover {
                 background-color: #555555;  /* Slightly lighter hover effect */
             }
-            QStatusBar {
+            QWidget[theme="dark"] QStatusBar {
                 background-color: #333333;  /* Darker status bar background */
                 color: #e0e0e0;  /* Light gray text for contrast */
                 padding: 3px;
             }
+    """
+
+    def __init__(self, pet):
+        """
+        Initialize the PetApp GUI with the given pet object.
         """
+        super().__init__()
+        self.pet = pet
+        self.stars = 0  # Initialize the star count
+        # The pet's name never changes, so only the star count varies
+        self._status_prefix = f"Pet Name: {self.pet.name} | Achievements: "
+        self._status_suffix = " ⭐"
+        self.setWindowTitle("Virtual Pet - PyQt6")
+        self.setMinimumWidth(500)
 
-        # Start in light mode
-        self.setStyleSheet(self.light_mode_stylesheet)
+        # Give the pixmap cache enough room for scaled pet images (in KB);
+        # this is a no-op before QApplication exists, so it lives here
+        # rather than at module import
+        QPixmapCache.setCacheLimit(2048)
+
+        # Coalesce rapid Save clicks into one write per debounce window
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self._do_save)
+        self._save_worker = None  # Keeps the in-flight worker (and its signals) alive
+
+        # Start in light mode; the stylesheet is parsed once and themes
+        # switch by flipping the "theme" property
+        self.setProperty("theme", "light")
+        self.setStyleSheet(PetApp.THEME_QSS)
         self.is_light_mode = True
 
         self.init_ui()
@@ -249,7 +353,8 @@ class PetApp(QWidget):
 
         # Add a status bar to display the pet's name and achievements
         self.status_bar = QStatusBar(self)
-        self.status_bar.showMessage(f"Pet Name: {self.pet.name} | Achievements: {self.stars} ⭐")
+        self._last_status_msg = ""
+        self.refresh_status_bar()
         main_layout.addWidget(self.status_bar)
 
         # Add the toggle mode and about buttons below the status bar
@@ -264,13 +369,18 @@ class PetApp(QWidget):
         """
         Toggle between light mode and dark mode.
         """
-        if self.is_light_mode:
-            self.setStyleSheet(self.dark_mode_stylesheet)
-            self.toggle_mode_button.setText("Light Mode")
-        else:
-            self.setStyleSheet(self.light_mode_stylesheet)
-            self.toggle_mode_button.setText("Dark Mode")
         self.is_light_mode = not self.is_light_mode
+        self.setProperty("theme", "light" if self.is_light_mode else "dark")
+        self.toggle_mode_button.setText("Dark Mode" if self.is_light_mode else "Light Mode")
+        # Repolish with the new property instead of reparsing a whole
+        # stylesheet; children cache their matched rules, so each one needs
+        # its own unpolish/polish to pick up the new theme
+        style = self.style()
+        style.unpolish(self)
+        style.polish(self)
+        for widget in self.findChildren(QWidget):
+            style.unpolish(widget)
+            style.polish(widget)
 
     def show_about(self):
         """
@@ -288,9 +398,8 @@ class PetApp(QWidget):
         """
         Load the default image or a placeholder if no image is available.
         """
-        if os.path.exists("spider circle.png"):
-            pixmap = QPixmap("spider circle.png").scaled(150, 150, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            
+        if _HAS_DEFAULT_IMG:
+            pixmap = _scaled_pixmap(_DEFAULT_IMG_PATH)
         else:
             pixmap = QPixmap(150, 150)
             pixmap.fill(Qt.GlobalColor.gray)
@@ -300,15 +409,32 @@ class PetApp(QWidget):
         """
         Open a file dialog to allow the user to upload a pet image.
         """
+        from PyQt6.QtWidgets import QFileDialog  # Deferred: only this action needs it
+
         file_path, _ = QFileDialog.getOpenFileName(self, "Upload Pet Image", "", "Images (*.png *.jpg *.jpeg *.bmp)")
         if file_path:
-            pixmap = QPixmap(file_path).scaled(150, 150, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.pet_image.setPixmap(pixmap)
+            self.pet_image.setPixmap(_scaled_pixmap(file_path))
+
+    def refresh_status_bar(self):
+        """
+        Push the pet's name and star count to the status bar, skipping the
+        update (and Qt's text relayout) when the message hasn't changed.
+        """
+        msg = self._status_prefix + str(self.stars) + self._status_suffix
+        if msg != self._last_status_msg:
+            self.status_bar.showMessage(msg)
+            self._last_status_msg = msg
 
     def update_status(self):
-        self.status_label.setText(self.pet.get_status())
-        self.tricks_label.setText("Tricks: " + self.pet.show_tricks())
-        self.status_bar.showMessage(f"Pet Name: {self.pet.name} | Achievements: {self.stars} ⭐")  # Update the status bar with the pet's name and stars
+        # Only touch the labels when their text actually changed, so saturated
+        # actions (e.g. Sleep at full energy) don't trigger repaints
+        new_status = self.pet.get_status()
+        if self.status_label.text() != new_status:
+            self.status_label.setText(new_status)
+        new_tricks = "Tricks: " + self.pet.show_tricks()
+        if self.tricks_label.text() != new_tricks:
+            self.tricks_label.setText(new_tricks)
+        self.refresh_status_bar()  # Update the status bar with the pet's name and stars
         self.check_for_star()
 
     def check_for_star(self):
@@ -322,13 +448,16 @@ class PetApp(QWidget):
             # Show the achievement message
             QMessageBox.information(self, "Achievement Unlocked!", "You earned a star for balancing hunger and energy!")
 
-            # Change the pet's values to random integers between 1 and 10
-            self.pet.hunger = random.randint(1, 10)
-            self.pet.energy = random.randint(1, 10)
-            self.pet.happiness = random.randint(1, 10)
+            # Change the pet's values to random integers between 1 and 10,
+            # drawn from one getrandbits call instead of three randint calls
+            r = random.getrandbits(24)
+            self.pet.hunger = (r & 0xFF) % 10 + 1
+            self.pet.energy = ((r >> 8) & 0xFF) % 10 + 1
+            self.pet.happiness = ((r >> 16) & 0xFF) % 10 + 1
+            self.pet._status_cache = None
 
             # Update the status bar with the new star count
-            self.status_bar.showMessage(f"Pet Name: {self.pet.name} | Achievements: {self.stars} ⭐")
+            self.refresh_status_bar()
 
             # Update the UI to reflect the new random values
             self.status_label.setText(self.pet.get_status())
@@ -351,72 +480,138 @@ class PetApp(QWidget):
         """
         Ask the user a math question (randomized operation). If they answer correctly,
         allow them to teach a new trick to the pet. Ensure trick is unique and not empty.
+        The prompts are non-modal so the event loop keeps running between them.
+        """
+        # One RNG draw supplies both operands and the operation
+        # (slightly biased modulo, fine for a toy quiz)
+        r = random.getrandbits(16)
+        num1 = (r & 0xFF) % 10 + 1
+        num2 = ((r >> 8) & 0x3F) % 10 + 1
+        operation = "+-*/"[(r >> 14) & 3]
+
+        # num2 is already in 1-10, so division is safe
+        self._train_answer = _OPS[operation](num1, num2)
+        self._train_is_division = operation == "/"
+
+        # Ask the question without blocking the event loop
+        dialog = QInputDialog(self)
+        dialog.setWindowTitle("Math Challenge")
+        dialog.setLabelText(f"What is {num1} {operation} {num2}?")
+        dialog.textValueSelected.connect(self._check_math_answer)
+        dialog.rejected.connect(lambda: QMessageBox.information(
+            self, "No Answer", "You did not answer the question."))
+        dialog.finished.connect(dialog.deleteLater)  # Don't accumulate hidden dialogs
+        dialog.open()
+
+    def _check_math_answer(self, answer):
+        """
+        Continuation for the math challenge: validate the answer and, when
+        correct, schedule the trick prompt on the next event-loop pass.
+        """
+        answer = answer.strip()
+        if not answer:
+            QMessageBox.information(self, "No Answer", "You did not answer the question.")
+            return
+        try:
+            user_answer = float(answer) if self._train_is_division else int(answer)
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Input", "Please enter a valid number.")
+            return
+
+        if user_answer == self._train_answer:
+            QTimer.singleShot(0, self._prompt_for_trick)
+        else:
+            QMessageBox.warning(self, "Wrong Answer", f"Incorrect! The correct answer was: {self._train_answer}")
+
+    def _prompt_for_trick(self):
         """
-        # Generate random numbers and choose a math operation
-        num1 = random.randint(1, 10)
-        num2 = random.randint(1, 10)
-        operation = random.choice(["+", "-", "*", "/"])
-
-        if operation == "+":
-            correct_answer = num1 + num2
-        elif operation == "-":
-            correct_answer = num1 - num2
-        elif operation == "*":
-            correct_answer = num1 * num2
-        elif operation == "/":
-            # Avoid division by zero and round to 1 decimal
-            num2 = random.randint(1, 10)
-            correct_answer = round(num1 / num2, 1)
-            operation = "/"  # Confirm symbol
-
-        # Ask the question
-        question = f"What is {num1} {operation} {num2}?"
-        answer, ok = QInputDialog.getText(self, "Math Challenge", question)
-
-        if ok and answer.strip():
-            try:
-                user_answer = float(answer.strip()) if operation == "/" else int(answer.strip())
-
-                if user_answer == correct_answer:
-                    # Prompt for trick name
-                    trick, ok = QInputDialog.getText(self, "Teach a Trick", "Enter a new trick:")
-                    if ok and trick.strip():
-                        trick = trick.strip()
-                        if trick in self.pet.tricks:
-                            QMessageBox.information(self, "Duplicate Trick", f"{self.pet.name} already knows this trick!")
-                        else:
-                            self.pet.train(trick)
-                            QMessageBox.information(self, "Trick Learned", f"{self.pet.name} learned a new trick: {trick}!")
-                            self.update_status()
-                    else:
-                        QMessageBox.information(self, "No Trick", "No trick was taught.")
-                else:
-                    QMessageBox.warning(self, "Wrong Answer", f"Incorrect! The correct answer was: {correct_answer}")
-            except ValueError:
-                QMessageBox.warning(self, "Invalid Input", "Please enter a valid number.")
+        Ask for the new trick's name, again without a nested modal event loop.
+        """
+        dialog = QInputDialog(self)
+        dialog.setWindowTitle("Teach a Trick")
+        dialog.setLabelText("Enter a new trick:")
+        dialog.textValueSelected.connect(self._teach_trick)
+        dialog.rejected.connect(lambda: QMessageBox.information(
+            self, "No Trick", "No trick was taught."))
+        dialog.finished.connect(dialog.deleteLater)  # Don't accumulate hidden dialogs
+        dialog.open()
+
+    def _teach_trick(self, trick):
+        """
+        Continuation for the trick prompt: teach the trick if it is new.
+        """
+        trick = trick.strip()
+        if not trick:
+            QMessageBox.information(self, "No Trick", "No trick was taught.")
+            return
+        if self.pet.train(trick):
+            QMessageBox.information(self, "Trick Learned", f"{self.pet.name} learned a new trick: {trick}!")
+            self.update_status()
         else:
-            QMessageBox.information(self, "No Answer", "You did not answer the question.")
+            QMessageBox.information(self, "Duplicate Trick", f"{self.pet.name} already knows this trick!")
+
+    def _pet_state_hash(self):
+        """
+        Hash the pet's saveable state, used to skip redundant writes.
+        """
+        pet = self.pet
+        return hash((pet.name, pet.hunger, pet.energy,
+                     pet.happiness, tuple(pet.tricks)))
 
     def save_pet(self):
-        try:
-            with open(SAVE_FILE, "w") as f:
-                json.dump(self.pet.to_dict(), f)
-            QMessageBox.information(self, "Saved", "Pet state saved!")
-        except (PermissionError, IOError) as e:
-            QMessageBox.critical(self, "Save Error", f"Failed to save pet data: {e}")
+        """
+        Request a save. Rapid clicks are debounced into a single write, and
+        an unchanged pet skips the disk entirely.
+        """
+        if (self._pet_state_hash() == self.pet._last_saved_hash
+                and not self._save_timer.isActive()):
+            QMessageBox.information(self, "Saved", "Pet state already saved!")
+            return
+        self._save_timer.start()
+
+    def _do_save(self):
+        """
+        Hand the write to a pooled worker thread so disk I/O never blocks
+        the event loop; the worker reports back via signals.
+        """
+        state_hash = self._pet_state_hash()
+        if state_hash == self.pet._last_saved_hash:
+            return
+        # Snapshot on the GUI thread so the worker never touches live state.
+        # The reference on self keeps the runnable's signals object alive
+        # until the queued result signal has been delivered.
+        worker = _SaveWorker(self.pet.to_dict())
+        worker.setAutoDelete(False)
+        worker.signals.finished.connect(lambda: self._on_save_done(state_hash))
+        worker.signals.failed.connect(self._on_save_failed)
+        self._save_worker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_save_done(self, state_hash):
+        self._save_worker = None
+        self.pet._last_saved_hash = state_hash
+        QMessageBox.information(self, "Saved", "Pet state saved!")
+
+    def _on_save_failed(self, error):
+        self._save_worker = None
+        QMessageBox.critical(self, "Save Error", f"Failed to save pet data: {error}")
 
 
 def load_pet():
     try:
-        with open(SAVE_FILE, "r") as f:
-            data = json.load(f)
+        with open(SAVE_FILE, "rb") as f:
+            data = pickle.load(f)
             return Pet.from_dict(data)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+    except (FileNotFoundError, pickle.UnpicklingError, EOFError) as e:
         QMessageBox.critical(None, "Load Error", f"Failed to load pet data: {e}")
         return None
 
 
-def main():
+if __name__ == "__main__":
+    # Only the standalone entry point needs QApplication; main.py owns the
+    # normal startup path
+    from PyQt6.QtWidgets import QApplication
+
     app = QApplication(sys.argv)
     pet = load_pet()
 
@@ -428,8 +623,4 @@ def main():
 
     window = PetApp(pet)
     window.show()
-    sys.exit(app.exec())
-
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(app.exec())
\ No newline at end of file